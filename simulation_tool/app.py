@@ -0,0 +1,13 @@
+"""
+Streamlit entry point for the Factory Physics Simulation Tool
+
+    streamlit run simulation_tool/app.py
+
+Streamlit puts this script's directory on sys.path, so simulation_engine
+and visualization import as regular packages. Only this file is
+re-executed on each rerun; the app module itself is imported once.
+"""
+
+from visualization.streamlit_app import main
+
+main()
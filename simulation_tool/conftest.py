@@ -0,0 +1,6 @@
+"""
+pytest configuration.
+
+Lives at the simulation_tool root so pytest puts this directory on
+sys.path and the tests can import simulation_engine like the app does.
+"""
@@ -10,7 +10,7 @@ from .factory_physics import (
     calculate_variability_impact
 )
 
-from .discrete_event_sim import DiscreteEventSimulator, Event
+from .discrete_event_sim import DiscreteEventSimulator, Event, HeapQueue
 from .production_line import ProductionLine, Station
 
 __all__ = [
@@ -21,6 +21,7 @@ __all__ = [
     'calculate_variability_impact',
     'DiscreteEventSimulator',
     'Event',
+    'HeapQueue',
     'ProductionLine',
     'Station'
 ]
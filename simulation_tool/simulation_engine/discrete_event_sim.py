@@ -4,33 +4,197 @@ Discrete Event Simulation Engine
 Core simulation engine for modeling manufacturing systems using discrete event simulation.
 """
 
-import heapq
-from dataclasses import dataclass, field
-from typing import Callable, Dict, List, Optional
-from enum import Enum
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+from enum import IntEnum
 import numpy as np
+from numba import njit
 
 
-class EventType(Enum):
-    """Types of events in the simulation"""
-    ARRIVAL = "arrival"
-    PROCESSING_START = "processing_start"
-    PROCESSING_END = "processing_end"
-    DEPARTURE = "departure"
+class EventType(IntEnum):
+    """Types of events in the simulation (values are stored in the typed heap)"""
+    ARRIVAL = 0
+    PROCESSING_START = 1
+    PROCESSING_END = 2
+    DEPARTURE = 3
 
 
-@dataclass
-class Event:
-    """Represents a discrete event in the simulation"""
+class SimStat(IntEnum):
+    """Indices of the simulator's counters in DiscreteEventSimulator.stats_arr"""
+    TOTAL_ENTITIES = 0
+    COMPLETED_ENTITIES = 1
+    EVENTS_PROCESSED = 2
+
+
+class Event(NamedTuple):
+    """
+    Represents a discrete event in the simulation.
+    
+    A plain tuple, so it orders by time natively; ids are -1 when unused.
+    """
     time: float
-    event_type: EventType
-    station_id: Optional[int] = None
-    entity_id: Optional[int] = None
-    data: Dict = field(default_factory=dict)
+    etype: int  # EventType value
+    station_id: int = -1
+    entity_id: int = -1
+
+
+@njit(cache=True)
+def _sift_up(times, etype, station, entity, pos):
+    """Move the entry at `pos` up until its parent is not later."""
+    time, code, station_id, entity_id = (
+        times[pos], etype[pos], station[pos], entity[pos]
+    )
+    while pos > 0:
+        parent = (pos - 1) >> 1
+        if times[parent] <= time:
+            break
+        times[pos] = times[parent]
+        etype[pos] = etype[parent]
+        station[pos] = station[parent]
+        entity[pos] = entity[parent]
+        pos = parent
+    times[pos] = time
+    etype[pos] = code
+    station[pos] = station_id
+    entity[pos] = entity_id
+
+
+@njit(cache=True)
+def _sift_down(times, etype, station, entity, pos, size):
+    """Move the entry at `pos` down until both children are not earlier."""
+    time, code, station_id, entity_id = (
+        times[pos], etype[pos], station[pos], entity[pos]
+    )
+    while True:
+        child = 2 * pos + 1
+        if child >= size:
+            break
+        right = child + 1
+        if right < size and times[right] < times[child]:
+            child = right
+        if times[child] >= time:
+            break
+        times[pos] = times[child]
+        etype[pos] = etype[child]
+        station[pos] = station[child]
+        entity[pos] = entity[child]
+        pos = child
+    times[pos] = time
+    etype[pos] = code
+    station[pos] = station_id
+    entity[pos] = entity_id
+
+
+@njit(cache=True)
+def _heap_push(times, etype, station, entity, size,
+               time, code, station_id, entity_id):
+    """Append an entry at `size` and restore the heap. Returns the new size."""
+    times[size] = time
+    etype[size] = code
+    station[size] = station_id
+    entity[size] = entity_id
+    _sift_up(times, etype, station, entity, size)
+    return size + 1
+
+
+@njit(cache=True)
+def _heap_pop(times, etype, station, entity, size):
+    """Remove the earliest entry. Returns its fields followed by the new size."""
+    time, code, station_id, entity_id = (
+        times[0], etype[0], station[0], entity[0]
+    )
+    size -= 1
+    if size > 0:
+        times[0] = times[size]
+        etype[0] = etype[size]
+        station[0] = station[size]
+        entity[0] = entity[size]
+        _sift_down(times, etype, station, entity, 0, size)
+    return time, code, station_id, entity_id, size
+
+
+@njit(cache=True)
+def _heapify(times, etype, station, entity, size):
+    """Restore the heap property over the first `size` entries in O(n)."""
+    for pos in range(size // 2 - 1, -1, -1):
+        _sift_down(times, etype, station, entity, pos, size)
+
+
+class HeapQueue:
+    """
+    Min-heap of events keyed on time.
+    
+    Event fields are stored as parallel NumPy arrays (struct-of-arrays) and
+    the sift operations are compiled with Numba, so ordering never goes
+    through Python-level comparisons. Unused station/entity ids are -1.
+    """
     
-    def __lt__(self, other):
-        """For priority queue ordering (earliest events first)"""
-        return self.time < other.time
+    def __init__(self, capacity: int = 1024):
+        self.times = np.empty(capacity, dtype=np.float64)
+        self.etype = np.empty(capacity, dtype=np.int8)
+        self.station = np.empty(capacity, dtype=np.int32)
+        self.entity = np.empty(capacity, dtype=np.int32)
+        self.size = 0
+    
+    def __len__(self) -> int:
+        return self.size
+    
+    def _grow(self, min_capacity: int):
+        """Reallocate the arrays with at least `min_capacity` slots."""
+        capacity = max(min_capacity, 2 * len(self.times))
+        for name in ('times', 'etype', 'station', 'entity'):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+    
+    def push(self, time: float, code: int, station_id: int = -1, entity_id: int = -1):
+        """Insert an event."""
+        if self.size == len(self.times):
+            self._grow(self.size + 1)
+        self.size = _heap_push(
+            self.times, self.etype, self.station, self.entity,
+            self.size, time, code, station_id, entity_id
+        )
+    
+    def push_many(self, times: np.ndarray, code: int, presorted: bool = False):
+        """
+        Insert a batch of events of one type in a single O(n) heapify.
+        
+        Args:
+            times: Event times
+            code: Event type code shared by the whole batch
+            presorted: Times are non-decreasing (lets an empty heap skip heapify)
+        """
+        was_empty = self.size == 0
+        count = len(times)
+        if self.size + count > len(self.times):
+            self._grow(self.size + count)
+        end = self.size + count
+        self.times[self.size:end] = times
+        self.etype[self.size:end] = code
+        self.station[self.size:end] = -1
+        self.entity[self.size:end] = -1
+        self.size = end
+        if was_empty and presorted:
+            return  # An ascending array already satisfies the heap property
+        _heapify(self.times, self.etype, self.station, self.entity, self.size)
+    
+    def pop(self) -> Tuple[float, int, int, int]:
+        """Remove and return the earliest event as (time, code, station, entity)."""
+        time, code, station_id, entity_id, self.size = _heap_pop(
+            self.times, self.etype, self.station, self.entity, self.size
+        )
+        return time, code, station_id, entity_id
+    
+    def peek_time(self) -> Optional[float]:
+        """Time of the earliest event, or None if empty."""
+        if self.size:
+            return float(self.times[0])
+        return None
+    
+    def clear(self):
+        """Remove all events (keeps the allocated arrays)."""
+        self.size = 0
 
 
 class DiscreteEventSimulator:
@@ -42,13 +206,9 @@ class DiscreteEventSimulator:
     
     def __init__(self):
         self.clock = 0.0
-        self.event_queue = []  # Priority queue (min-heap)
-        self.stats = {
-            'total_entities': 0,
-            'completed_entities': 0,
-            'events_processed': 0
-        }
-        self.event_handlers = {}
+        self.event_queue = HeapQueue()  # Priority queue (min-heap)
+        self.stats_arr = np.zeros(len(SimStat), dtype=np.int64)  # Indexed by SimStat
+        self.event_handlers = [None] * len(EventType)  # Indexed by EventType value
     
     def schedule_event(self, event: Event):
         """
@@ -57,7 +217,21 @@ class DiscreteEventSimulator:
         Args:
             event: Event to schedule
         """
-        heapq.heappush(self.event_queue, event)
+        self.event_queue.push(*event)
+    
+    def bulk_schedule_arrivals(self, times: np.ndarray, presorted: bool = False):
+        """
+        Schedule many arrival events at once.
+        
+        Args:
+            times: Array of arrival times
+            presorted: Times are already in non-decreasing order
+        """
+        self.event_queue.push_many(
+            np.asarray(times, dtype=np.float64),
+            EventType.ARRIVAL,
+            presorted=presorted
+        )
     
     def register_handler(self, event_type: EventType, handler: Callable):
         """
@@ -69,6 +243,11 @@ class DiscreteEventSimulator:
         """
         self.event_handlers[event_type] = handler
     
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Counters as a dict keyed by lower-case SimStat name (a snapshot)."""
+        return {stat.name.lower(): int(self.stats_arr[stat]) for stat in SimStat}
+    
     def run(self, max_time: float = None, max_events: int = None):
         """
         Run the simulation until stopping condition is met.
@@ -77,34 +256,35 @@ class DiscreteEventSimulator:
             max_time: Maximum simulation time (None = no limit)
             max_events: Maximum number of events to process (None = no limit)
         """
-        while self.event_queue:
+        event_queue = self.event_queue
+        handlers = self.event_handlers
+        # Count in a local int and store once at the end (cheaper than an array write per event)
+        events_processed = int(self.stats_arr[SimStat.EVENTS_PROCESSED])
+        while event_queue:
             if max_time is not None and self.clock >= max_time:
                 break
-            if max_events is not None and self.stats['events_processed'] >= max_events:
+            if max_events is not None and events_processed >= max_events:
                 break
             
             # Get next event
-            event = heapq.heappop(self.event_queue)
+            event = Event._make(event_queue.pop())
             self.clock = event.time
             
             # Handle event
-            if event.event_type in self.event_handlers:
-                self.event_handlers[event.event_type](event)
+            handler = handlers[event.etype]
+            if handler is not None:
+                handler(event)
             
-            self.stats['events_processed'] += 1
+            events_processed += 1
+        
+        self.stats_arr[SimStat.EVENTS_PROCESSED] = events_processed
     
     def get_next_event_time(self) -> Optional[float]:
         """Get the time of the next scheduled event."""
-        if self.event_queue:
-            return self.event_queue[0].time
-        return None
+        return self.event_queue.peek_time()
     
     def reset(self):
         """Reset the simulator to initial state."""
         self.clock = 0.0
-        self.event_queue = []
-        self.stats = {
-            'total_entities': 0,
-            'completed_entities': 0,
-            'events_processed': 0
-        }
+        self.event_queue.clear()
+        self.stats_arr.fill(0)
@@ -9,15 +9,81 @@ Implements core Factory Physics relationships:
 """
 
 import numpy as np
-from typing import Dict, List, Optional
+from numba import njit
+from typing import Dict, List, Optional, Union
+
+# Fast-math flags minus 'nnan'/'ninf': saturated stations legitimately return inf
+_FASTMATH = {'nsz', 'arcp', 'contract', 'afn', 'reassoc'}
+
+# Explicit signatures compile the kernels eagerly at import (or load them
+# from the on-disk cache) instead of on the first call
+_SCALAR4 = 'float64(float64, float64, float64, float64)'
+_ARRAY4 = 'float64[::1](float64[::1], float64[::1], float64[::1], float64[::1])'
+
+
+@njit(_SCALAR4, cache=True)
+def _kingman(te, u, ca, ce):
+    """Kingman's approximation for a single station (scalar kernel)."""
+    if u >= 1.0:
+        return np.inf
+    if u <= 0.0:
+        return te
+    return ((ca * ca + ce * ce) * 0.5) * (u / (1.0 - u)) * te + te
+
+
+@njit(_ARRAY4, cache=True, fastmath=_FASTMATH)
+def _kingman_batch(te, u, ca, ce):
+    """Kingman's approximation over equally sized 1-D arrays."""
+    out = np.empty(te.size)
+    for i in range(te.size):
+        out[i] = _kingman(te[i], u[i], ca[i], ce[i])
+    return out
+
+
+@njit('float64(float64, float64)', cache=True)
+def _utilization(arrival_rate, processing_rate):
+    """Utilization of a single station, capped at 1 (scalar kernel)."""
+    if processing_rate <= 0.0:
+        return 1.0  # Infinite utilization if processing rate is zero
+    return min(arrival_rate / processing_rate, 1.0)
+
+
+@njit('float64[::1](float64[::1], float64[::1])', cache=True)
+def _utilization_batch(arrival_rate, processing_rate):
+    """Utilization over equally sized 1-D arrays."""
+    out = np.empty(arrival_rate.size)
+    for i in range(arrival_rate.size):
+        out[i] = _utilization(arrival_rate[i], processing_rate[i])
+    return out
+
+
+def _kernel_args(*args):
+    """
+    Broadcast the arguments together and flatten them for the batch kernels.
+    
+    The kernels' explicit signatures take writable C-contiguous float64
+    arrays, so read-only inputs (e.g. pandas column views) are copied.
+    
+    Returns:
+        Tuple (broadcast shape, list of flat arrays)
+    """
+    arrays = [np.asarray(arg, dtype=np.float64) for arg in args]
+    shape = np.broadcast_shapes(*(a.shape for a in arrays))
+    flat = []
+    for a in arrays:
+        if a.shape != shape:
+            a = np.broadcast_to(a, shape)
+        a = a.ravel()  # Copies unless already contiguous
+        flat.append(a if a.flags.writeable else a.copy())
+    return shape, flat
 
 
 def calculate_cycle_time(
-    mean_processing_time: float,
-    utilization: float,
-    cv_arrival: float = 1.0,
-    cv_processing: float = 1.0
-) -> float:
+    mean_processing_time: Union[float, np.ndarray],
+    utilization: Union[float, np.ndarray],
+    cv_arrival: Union[float, np.ndarray] = 1.0,
+    cv_processing: Union[float, np.ndarray] = 1.0
+) -> Union[float, np.ndarray]:
     """
     Calculate cycle time using Kingman's approximation.
     
@@ -35,22 +101,23 @@ def calculate_cycle_time(
         cv_arrival: Coefficient of variation of arrivals (default 1.0 for Poisson -> memoryless)
         cv_processing: Coefficient of variation of processing (default 1.0)
     
+    Any argument may be an ndarray, in which case the inputs are broadcast
+    together and an array of cycle times is returned (useful for sweeps).
+    
     Returns:
         Cycle time (CT)
     """
-    if utilization >= 1.0:
-        return np.inf  # Infinite queue if utilization is 100%
-    
-    if utilization <= 0:
-        return mean_processing_time  # No waiting if no utilization
-    
-    # Kingman's approximation
-    variability_term = (cv_arrival**2 + cv_processing**2) / 2
-    utilization_term = utilization / (1 - utilization)
-    
-    cycle_time = variability_term * utilization_term * mean_processing_time + mean_processing_time
-    
-    return cycle_time
+    args = (mean_processing_time, utilization, cv_arrival, cv_processing)
+    if any(isinstance(arg, np.ndarray) for arg in args):
+        shape, flat = _kernel_args(*args)
+        return _kingman_batch(*flat).reshape(shape)
+    
+    return _kingman(
+        float(mean_processing_time),
+        float(utilization),
+        float(cv_arrival),
+        float(cv_processing)
+    )
 
 
 def calculate_wip(throughput: float, cycle_time: float) -> float:
@@ -88,9 +155,9 @@ def calculate_throughput(wip: float, cycle_time: float) -> float:
 
 
 def calculate_utilization(
-    arrival_rate: float,
-    processing_rate: float
-) -> float:
+    arrival_rate: Union[float, np.ndarray],
+    processing_rate: Union[float, np.ndarray]
+) -> Union[float, np.ndarray]:
     """
     Calculate station utilization.
     
@@ -104,25 +171,30 @@ def calculate_utilization(
         arrival_rate: Arrival rate (λ)
         processing_rate: Processing rate (μ)
     
+    Either argument may be an ndarray, in which case the inputs are
+    broadcast together and an array of utilizations is returned.
+    
     Returns:
         Utilization (0-1)
     """
-    if processing_rate <= 0:
-        return 1.0  # Infinite utilization if processing rate is zero
+    if isinstance(arrival_rate, np.ndarray) or isinstance(processing_rate, np.ndarray):
+        shape, flat = _kernel_args(arrival_rate, processing_rate)
+        return _utilization_batch(*flat).reshape(shape)
     
-    utilization = arrival_rate / processing_rate
-    return min(utilization, 1.0)  # Cap at 1.0
+    return _utilization(float(arrival_rate), float(processing_rate))
 
 
 def calculate_variability_impact(
-    base_cycle_time: float,
-    base_cv: float,
-    new_cv: float,
-    utilization: float
-) -> float:
+    base_cycle_time: Union[float, np.ndarray],
+    base_cv: Union[float, np.ndarray],
+    new_cv: Union[float, np.ndarray],
+    utilization: Union[float, np.ndarray]
+) -> Union[float, np.ndarray]:
     """
     Calculate how changing variability affects cycle time.
     
+    Accepts arrays as well as scalars (see calculate_cycle_time).
+    
     Args:
         base_cycle_time: Original cycle time
         base_cv: Original coefficient of variation
@@ -132,21 +204,17 @@ def calculate_variability_impact(
     Returns:
         New cycle time after variability change
     """
-    if utilization >= 1.0:
-        return np.inf
-    
     # Extract the base processing time from cycle time
-    # CT = variability_term * utilization_term * te + te
-    # Rearranging: te = CT / (variability_term * utilization_term + 1)
-    utilization_term = utilization / (1 - utilization) if utilization < 1.0 else np.inf
-    base_variability_term = (1.0**2 + base_cv**2) / 2  # Assuming ca=1.0
-    base_te = base_cycle_time / (base_variability_term * utilization_term + 1)
+    # CT = variability_term * utilization_term * te + te, so CT(te) = te * CT(1)
+    base_te = base_cycle_time / calculate_cycle_time(1.0, utilization, 1.0, base_cv)  # Assuming ca=1.0
     
     # Calculate new cycle time with new CV
-    new_variability_term = (1.0**2 + new_cv**2) / 2
-    new_cycle_time = new_variability_term * utilization_term * base_te + base_te
-    
-    return new_cycle_time
+    return calculate_cycle_time(base_te, utilization, 1.0, new_cv)
+
+
+def _processing_rates(stations: List[Dict]) -> np.ndarray:
+    """Processing rates of the stations (default 1.0)."""
+    return np.array([station.get('processing_rate', 1.0) for station in stations], dtype=np.float64)
 
 
 def calculate_bottleneck_station(
@@ -156,20 +224,18 @@ def calculate_bottleneck_station(
     """
     Identify the bottleneck station (highest utilization).
     
+    Every station sees the same arrival rate, so the highest-utilization
+    station is simply the one with the lowest processing rate (the first
+    one on ties), whatever the arrival rate.
+    
     Args:
         stations: List of station dictionaries with 'processing_rate' key
-        arrival_rate: System arrival rate
+        arrival_rate: System arrival rate (does not affect the result)
     
     Returns:
         Index of bottleneck station
     """
-    utilizations = []
-    for station in stations:
-        processing_rate = station.get('processing_rate', 1.0)
-        util = calculate_utilization(arrival_rate, processing_rate)
-        utilizations.append(util)
-    
-    return np.argmax(utilizations)
+    return int(np.argmin(_processing_rates(stations)))
 
 
 def calculate_system_throughput(
@@ -186,8 +252,7 @@ def calculate_system_throughput(
     Returns:
         System throughput
     """
-    bottleneck_idx = calculate_bottleneck_station(stations, arrival_rate)
-    bottleneck_rate = stations[bottleneck_idx].get('processing_rate', 1.0)
+    bottleneck_rate = float(np.min(_processing_rates(stations)))
     
     return min(arrival_rate, bottleneck_rate)
 
@@ -210,28 +275,21 @@ def calculate_system_cycle_time(
     Returns:
         Total system cycle time
     """
-    if cv_arrivals is None:
-        cv_arrivals = [1.0] * len(stations)
-    if cv_processing is None:
-        cv_processing = [1.0] * len(stations)
-    
-    total_ct = 0.0
-    current_arrival_rate = arrival_rate
-    
-    for i, station in enumerate(stations):
-        mean_pt = station.get('mean_processing_time', 1.0)
-        processing_rate = 1.0 / mean_pt if mean_pt > 0 else np.inf
-        util = calculate_utilization(current_arrival_rate, processing_rate)
+    mean_pt = np.fromiter(
+        (station.get('mean_processing_time', 1.0) for station in stations),
+        dtype=float,
+        count=len(stations)
+    )
+    cv_a = np.ones(len(stations)) if cv_arrivals is None else np.asarray(cv_arrivals, dtype=float)
+    cv_p = np.ones(len(stations)) if cv_processing is None else np.asarray(cv_processing, dtype=float)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        processing_rate = np.where(mean_pt > 0, 1.0 / mean_pt, np.inf)
         
-        ct = calculate_cycle_time(
-            mean_pt,
-            util,
-            cv_arrivals[i],
-            cv_processing[i]
+        # Arrival rate seen by each station is the throughput of everything upstream
+        station_arrival_rate = np.minimum.accumulate(
+            np.concatenate(([arrival_rate], processing_rate[:-1]))
         )
-        total_ct += ct
-        
-        # Update arrival rate for next station (throughput of current station)
-        current_arrival_rate = min(current_arrival_rate, processing_rate)
+        util = np.minimum(station_arrival_rate / processing_rate, 1.0)
     
-    return total_ct
+    return float(calculate_cycle_time(mean_pt, util, cv_a, cv_p).sum())
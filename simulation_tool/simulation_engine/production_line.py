@@ -4,71 +4,205 @@ Production Line Simulation
 Models a multi-stage production line with CONWIP control.
 """
 
+import warnings
 import numpy as np
+from collections import deque
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional
-from enum import Enum
-from .discrete_event_sim import DiscreteEventSimulator, Event, EventType
+from typing import Callable, List, Dict, Optional
+from enum import IntEnum
+from numba import njit
+from .discrete_event_sim import (
+    DiscreteEventSimulator,
+    Event,
+    EventType,
+    SimStat,
+    _heap_pop,
+    _heap_push
+)
+from .bsp_engine import run_bsp
 from .factory_physics import calculate_cycle_time, calculate_utilization
 
 
-class StationState(Enum):
-    """States a station can be in"""
-    IDLE = "idle"
-    PROCESSING = "processing"
-    BLOCKED = "blocked"  # Finished but downstream is full
-    STARVED = "starved"  # Ready but no material available
+class StationState(IntEnum):
+    """States a station can be in (values index the struct-of-arrays storage)"""
+    IDLE = 0
+    PROCESSING = 1
+    BLOCKED = 2  # Finished but downstream is full
+    STARVED = 3  # Ready but no material available
+
+
+# Plain-int state codes for the hot paths (enum attribute access is slow)
+_IDLE = int(StationState.IDLE)
+_PROCESSING = int(StationState.PROCESSING)
+_BLOCKED = int(StationState.BLOCKED)
+_STARVED = int(StationState.STARVED)
+
+_ARRIVAL = int(EventType.ARRIVAL)
+_PROCESSING_END = int(EventType.PROCESSING_END)
+
+# Processing times are drawn from the RNG in batches of this size
+_SAMPLE_BATCH_SIZE = 4096
+
+# Starting size of the per-job record arrays (they double when full)
+_INITIAL_JOB_CAPACITY = 1024
+
+
+class StationArrays:
+    """
+    Struct-of-arrays storage for per-station state and statistics.
+    
+    Entry i of every array belongs to the station with station_id i. Keeping
+    the hot per-event fields in contiguous arrays avoids per-object attribute
+    lookups and lets the same state be handed to compiled kernels as-is.
+    """
+    
+    def __init__(self, num_stations: int):
+        self.state = np.zeros(num_stations, dtype=np.int8)
+        self.current_job = np.full(num_stations, -1, dtype=np.int64)  # -1 = no job
+        self.total_processed = np.zeros(num_stations, dtype=np.int64)
+        # Time spent in each state, state_time[state, i]; the total_* arrays are row views
+        self.state_time = np.zeros((len(StationState), num_stations), dtype=np.float64)
+        self.total_processing_time = self.state_time[_PROCESSING]
+        self.total_idle_time = self.state_time[_IDLE]
+        self.total_blocked_time = self.state_time[_BLOCKED]
+        self.total_starved_time = self.state_time[_STARVED]
+        self.last_state_change_time = np.zeros(num_stations, dtype=np.float64)
+    
+    def update_statistics(self, i: int, current_time: float):
+        """Charge time since the last state change of station i to its current state."""
+        delta = current_time - self.last_state_change_time[i]
+        if delta > 0.0:  # Back-to-back changes at one instant charge nothing
+            self.state_time[self.state[i], i] += delta
+            self.last_state_change_time[i] = current_time
+    
+    def update_all_statistics(self, current_time: float):
+        """update_statistics for every station at once."""
+        delta = current_time - self.last_state_change_time
+        self.state_time[self.state, np.arange(self.state.size)] += np.maximum(delta, 0.0)
+        np.maximum(self.last_state_change_time, current_time, out=self.last_state_change_time)
+    
+    def get_utilization(self, current_time: float) -> np.ndarray:
+        """Fraction of time each station was not idle, blocked or starved (call after updating)."""
+        if current_time <= 0:
+            return np.zeros(self.state.size)
+        not_working = self.state_time[[_IDLE, _BLOCKED, _STARVED]].sum(axis=0)
+        return (current_time - not_working) / current_time
+    
+    def reset(self):
+        """Reset all stations to idle with zeroed statistics."""
+        self.state.fill(_IDLE)
+        self.current_job.fill(-1)
+        self.total_processed.fill(0)
+        self.state_time.fill(0.0)
+        self.last_state_change_time.fill(0.0)
+
+
+def _array_field(name: str, cast: Callable):
+    """Property exposing entry `station_id` of StationArrays.<name>."""
+    def getter(self):
+        return cast(getattr(self.arrays, name)[self.station_id])
+    
+    def setter(self, value):
+        getattr(self.arrays, name)[self.station_id] = value
+    
+    return property(getter, setter)
+
+
+def _check_station_params(name: str, mean_processing_time: float, cv_processing: float):
+    """
+    Raise ValueError unless a station's parameters can be sampled.
+    
+    Every engine samples from these; a NaN would hang the compiled gamma draws.
+    """
+    if not (np.isfinite(mean_processing_time) and mean_processing_time > 0):
+        raise ValueError(
+            f"{name}: mean processing time must be finite and > 0, got {mean_processing_time!r}"
+        )
+    if not (np.isfinite(cv_processing) and cv_processing >= 0):
+        raise ValueError(f"{name}: CV must be finite and >= 0, got {cv_processing!r}")
 
 
 @dataclass
 class Station:
-    """Represents a single station in the production line"""
+    """
+    Represents a single station in the production line.
+    
+    Configuration lives on the object; run-time state and statistics are
+    views into a shared StationArrays (a private one is created for a
+    standalone station).
+    """
     station_id: int
     name: str
     mean_processing_time: float
     cv_processing: float = 1.0  # Coefficient of variation
     buffer_capacity: int = 0  # 0 = no buffer (blocking)
     
-    # State
-    state: StationState = StationState.IDLE
-    current_job: Optional[int] = None
-    queue: List[int] = field(default_factory=list)
+    queue: deque = field(default_factory=deque)
+    queue_set: set = field(default_factory=set)  # Mirrors queue for O(1) membership
     buffer: List[int] = field(default_factory=list)
+    arrays: Optional[StationArrays] = field(default=None, repr=False)
+    rng: Optional[np.random.Generator] = field(default=None, repr=False)
+    
+    # State
+    state = _array_field('state', StationState)
+    total_processed = _array_field('total_processed', int)
     
     # Statistics
-    total_processed: int = 0
-    total_processing_time: float = 0.0
-    total_idle_time: float = 0.0
-    total_blocked_time: float = 0.0
-    total_starved_time: float = 0.0
-    last_state_change_time: float = 0.0
+    total_processing_time = _array_field('total_processing_time', float)
+    total_idle_time = _array_field('total_idle_time', float)
+    total_blocked_time = _array_field('total_blocked_time', float)
+    total_starved_time = _array_field('total_starved_time', float)
+    last_state_change_time = _array_field('last_state_change_time', float)
     
-    def get_processing_time(self) -> float:
-        """Sample processing time from distribution."""
-        if self.cv_processing == 0:
-            return self.mean_processing_time
-        
-        # Use gamma distribution to match mean and CV
+    def __post_init__(self):
+        if self.arrays is None:
+            self.arrays = StationArrays(self.station_id + 1)
+        if self.rng is None:
+            self.rng = np.random.default_rng()
+        self._refresh_sampling()
+    
+    def _refresh_sampling(self):
+        """Recompute gamma parameters and discard pre-drawn samples."""
+        _check_station_params(self.name, self.mean_processing_time, self.cv_processing)
         # For gamma: mean = shape * scale, CV = 1/sqrt(shape) -> summing multiple expo waiting periods
-        if self.cv_processing > 0:
-            shape = 1.0 / (self.cv_processing ** 2)
-            scale = self.mean_processing_time / shape
-            return np.random.gamma(shape, scale)
+        self._cv_zero = self.cv_processing <= 0
+        if self._cv_zero:
+            self._shape = 0.0
+            self._scale = 0.0
         else:
-            return self.mean_processing_time
+            self._shape = 1.0 / (self.cv_processing ** 2)
+            self._scale = self.mean_processing_time / self._shape
+        self._sample_buf = np.empty(_SAMPLE_BATCH_SIZE)
+        self._sample_idx = _SAMPLE_BATCH_SIZE  # Forces a fill on first use
+    
+    def _fill_samples(self):
+        """Draw the next batch of processing times (constant when CV is zero)."""
+        if self._cv_zero:
+            self._sample_buf = np.full(_SAMPLE_BATCH_SIZE, float(self.mean_processing_time))
+        else:
+            self._sample_buf = self.rng.gamma(self._shape, self._scale, _SAMPLE_BATCH_SIZE)
+        self._sample_idx = 0
+    
+    @property
+    def current_job(self) -> Optional[int]:
+        job = self.arrays.current_job[self.station_id]
+        return None if job < 0 else int(job)
+    
+    @current_job.setter
+    def current_job(self, job_id: Optional[int]):
+        self.arrays.current_job[self.station_id] = -1 if job_id is None else job_id
+    
+    def get_processing_time(self) -> float:
+        """Sample processing time from distribution (gamma matching mean and CV)."""
+        if self._sample_idx >= _SAMPLE_BATCH_SIZE:
+            self._fill_samples()
+        value = self._sample_buf[self._sample_idx]
+        self._sample_idx += 1
+        return value
     
     def update_statistics(self, current_time: float):
         """Update time-based statistics."""
-        time_elapsed = current_time - self.last_state_change_time
-        
-        if self.state == StationState.IDLE:
-            self.total_idle_time += time_elapsed
-        elif self.state == StationState.BLOCKED:
-            self.total_blocked_time += time_elapsed
-        elif self.state == StationState.STARVED:
-            self.total_starved_time += time_elapsed
-        
-        self.last_state_change_time = current_time
+        self.arrays.update_statistics(self.station_id, current_time)
     
     def get_utilization(self, current_time: float) -> float:
         """Calculate utilization up to current time."""
@@ -80,6 +214,222 @@ class Station:
         return 0.0
 
 
+@njit(cache=True)
+def _jit_try_start(i, job_id, clock, mean_pt, shape, scale, rng, samples, sample_idx,
+                   state, current_job, state_time, last_state_change_time,
+                   queue, queue_head, queue_len, times, etype, station, entity, size):
+    """Compiled ProductionLine._try_start_processing. Returns the new heap size."""
+    if state[i] == _IDLE:
+        delta = clock - last_state_change_time[i]
+        if delta > 0.0:
+            state_time[_IDLE, i] += delta
+            last_state_change_time[i] = clock
+        state[i] = _PROCESSING
+        current_job[i] = job_id
+        
+        if shape[i] <= 0.0:  # Zero CV
+            processing_time = mean_pt[i]
+        else:
+            if sample_idx[i] >= _SAMPLE_BATCH_SIZE:
+                samples[i, :] = rng.gamma(shape[i], scale[i], _SAMPLE_BATCH_SIZE)
+                sample_idx[i] = 0
+            processing_time = samples[i, sample_idx[i]]
+            sample_idx[i] += 1
+        processing_time = max(0.001, processing_time)
+        return _heap_push(times, etype, station, entity, size,
+                          clock + processing_time, _PROCESSING_END, i, job_id)
+    
+    # A job sits at one station at a time, so each FIFO holds <= conwip_level jobs
+    capacity = queue.shape[1]
+    queue[i, (queue_head[i] + queue_len[i]) % capacity] = job_id
+    queue_len[i] += 1
+    return size
+
+
+@njit(cache=True)
+def _run_sim(end_time, conwip_level, mean_pt, shape, scale, arrival_times, rng,
+             state, current_job, total_processed, state_time, last_state_change_time):
+    """
+    Compiled event loop equivalent to the handler-based DES in ProductionLine.
+    
+    Station state lives in the StationArrays passed in (updated in place),
+    pending events in a typed heap preloaded with the ascending arrival
+    times, and processing times come from per-station batches of gamma
+    samples drawn from `rng`. Job ids start at 1.
+    """
+    n = mean_pt.size
+    n_arrivals = arrival_times.size
+    
+    # Typed heap: arrivals plus at most one pending completion per station
+    capacity = n_arrivals + n + 1
+    times = np.empty(capacity, dtype=np.float64)
+    etype = np.empty(capacity, dtype=np.int8)
+    station = np.full(capacity, -1, dtype=np.int32)
+    entity = np.full(capacity, -1, dtype=np.int32)
+    times[:n_arrivals] = arrival_times
+    etype[:n_arrivals] = _ARRIVAL
+    size = n_arrivals
+    
+    queue = np.empty((n, max(conwip_level, 1)), dtype=np.int64)
+    queue_head = np.zeros(n, dtype=np.int64)
+    queue_len = np.zeros(n, dtype=np.int64)
+    samples = np.empty((n, _SAMPLE_BATCH_SIZE), dtype=np.float64)
+    sample_idx = np.full(n, _SAMPLE_BATCH_SIZE, dtype=np.int64)
+    
+    # CONWIP backlog: append-only, consumed from backlog_head
+    backlog = np.empty(n_arrivals, dtype=np.float64)
+    backlog_head = 0
+    backlog_tail = 0
+    max_queue_length = 0
+    
+    job_arrival = np.empty(n_arrivals + 1, dtype=np.float64)
+    job_completion = np.full(n_arrivals + 1, np.nan)
+    completed = np.empty(n_arrivals, dtype=np.int64)
+    n_completed = 0
+    entity_counter = 0
+    system_wip = 0
+    clock = 0.0
+    events_processed = 0
+    
+    while size > 0:
+        if clock >= end_time:
+            break
+        
+        clock, code, station_id, job_id, size = _heap_pop(times, etype, station, entity, size)
+        
+        if code == _ARRIVAL:
+            if system_wip < conwip_level:
+                entity_counter += 1
+                system_wip += 1
+                job_arrival[entity_counter] = clock
+                size = _jit_try_start(0, entity_counter, clock, mean_pt, shape, scale, rng,
+                                      samples, sample_idx, state, current_job, state_time,
+                                      last_state_change_time, queue, queue_head, queue_len,
+                                      times, etype, station, entity, size)
+            else:
+                backlog[backlog_tail] = clock
+                backlog_tail += 1
+                max_queue_length = max(max_queue_length, backlog_tail - backlog_head)
+        
+        elif code == _PROCESSING_END:
+            delta = clock - last_state_change_time[station_id]
+            if delta > 0.0:
+                state_time[_PROCESSING, station_id] += delta
+                last_state_change_time[station_id] = clock
+            total_processed[station_id] += 1
+            current_job[station_id] = -1
+            state[station_id] = _IDLE
+            
+            if station_id < n - 1:
+                size = _jit_try_start(station_id + 1, job_id, clock, mean_pt, shape, scale, rng,
+                                      samples, sample_idx, state, current_job, state_time,
+                                      last_state_change_time, queue, queue_head, queue_len,
+                                      times, etype, station, entity, size)
+            else:
+                job_completion[job_id] = clock
+                completed[n_completed] = job_id
+                n_completed += 1
+                system_wip -= 1
+                
+                if backlog_tail > backlog_head and system_wip < conwip_level:
+                    entity_counter += 1
+                    system_wip += 1
+                    job_arrival[entity_counter] = backlog[backlog_head]
+                    backlog_head += 1
+                    size = _jit_try_start(0, entity_counter, clock, mean_pt, shape, scale, rng,
+                                          samples, sample_idx, state, current_job, state_time,
+                                          last_state_change_time, queue, queue_head, queue_len,
+                                          times, etype, station, entity, size)
+            
+            if queue_len[station_id] > 0:
+                next_job = queue[station_id, queue_head[station_id]]
+                queue_head[station_id] = (queue_head[station_id] + 1) % queue.shape[1]
+                queue_len[station_id] -= 1
+                size = _jit_try_start(station_id, next_job, clock, mean_pt, shape, scale, rng,
+                                      samples, sample_idx, state, current_job, state_time,
+                                      last_state_change_time, queue, queue_head, queue_len,
+                                      times, etype, station, entity, size)
+        
+        events_processed += 1
+    
+    return (clock, events_processed, entity_counter, system_wip,
+            job_arrival[:entity_counter + 1], job_completion, completed[:n_completed],
+            backlog[:backlog_tail], backlog_head, max_queue_length,
+            queue, queue_head, queue_len)
+
+
+@njit(cache=True)
+def _euler_run(n_steps, warmup_steps, dt, arrival_rate, service_rate, conwip_level, rng):
+    """
+    Forward-Euler, time-stepped approximation of the CONWIP line.
+    
+    Treats the line as a Markovian tandem queue: each step draws Poisson
+    arrivals (rate arrival_rate) and, at every non-empty station, Poisson
+    service completions (rate service_rate[i]) capped by the station's
+    queue length at the start of the step. Stations are updated from
+    downstream to upstream so all completions use start-of-step levels.
+    
+    Every queue is FIFO, so jobs leave the line in arrival order; each
+    completion is matched to the oldest outstanding arrival step. As in
+    ProductionLine.get_statistics, only jobs that arrived (joined the line
+    or the CONWIP backlog) at or after warmup_steps are counted, and their
+    cycle times include the wait in the backlog.
+    
+    Returns per-station processed counts and busy steps, plus the number
+    of counted completions, the sum of their cycle times, and the backlog
+    counters.
+    """
+    n = service_rate.size
+    queue_len = np.zeros(n, dtype=np.int64)
+    processed = np.zeros(n, dtype=np.int64)
+    busy_steps = np.zeros(n, dtype=np.int64)
+    system_wip = 0
+    backlog = 0
+    max_backlog = 0
+    rejected = 0
+    completed = 0
+    cycle_time_sum = 0.0
+    outstanding = np.zeros(n_steps, dtype=np.int64)  # Jobs that arrived at step k, not yet done
+    oldest = 0
+    arrival_mean = arrival_rate * dt
+    service_mean = service_rate * dt
+    
+    for k in range(n_steps):
+        for i in range(n - 1, -1, -1):
+            if queue_len[i] > 0:
+                busy_steps[i] += 1
+                done = min(rng.poisson(service_mean[i]), queue_len[i])
+                queue_len[i] -= done
+                processed[i] += done
+                if i < n - 1:
+                    queue_len[i + 1] += done
+                else:
+                    system_wip -= done
+                    while done > 0:
+                        while outstanding[oldest] == 0:
+                            oldest += 1
+                        matched = min(done, outstanding[oldest])
+                        outstanding[oldest] -= matched
+                        done -= matched
+                        if oldest >= warmup_steps:
+                            completed += matched
+                            cycle_time_sum += matched * (k - oldest) * dt
+        
+        # Admit FIFO: the CONWIP backlog goes ahead of this step's arrivals
+        arrivals = rng.poisson(arrival_mean)
+        outstanding[k] = arrivals
+        free = conwip_level - system_wip
+        from_backlog = min(backlog, free)
+        from_arrivals = min(arrivals, free - from_backlog)
+        queue_len[0] += from_backlog + from_arrivals
+        system_wip += from_backlog + from_arrivals
+        backlog += arrivals - from_arrivals - from_backlog
+        rejected += arrivals - from_arrivals
+        max_backlog = max(max_backlog, backlog)
+    
+    return processed, busy_steps, completed, cycle_time_sum, rejected, backlog, max_backlog
+
+
 class ProductionLine:
     """
     Multi-stage production line with CONWIP control.
@@ -94,7 +444,8 @@ class ProductionLine:
         mean_processing_times: Optional[List[float]] = None,
         cv_processing: Optional[List[float]] = None,
         arrival_rate: float = 0.1,
-        cv_arrival: float = 1.0
+        cv_arrival: float = 1.0,
+        seed: Optional[int] = None
     ):
         """
         Initialize production line.
@@ -106,6 +457,7 @@ class ProductionLine:
             cv_processing: Coefficient of variation for each station
             arrival_rate: Arrival rate (jobs per time unit)
             cv_arrival: Coefficient of variation of arrivals
+            seed: Seed for the line's random generator (None = fresh entropy)
         """
         self.num_stations = num_stations
         self.conwip_level = conwip_level
@@ -118,12 +470,16 @@ class ProductionLine:
         if cv_processing is None:
             cv_processing = [1.0] * num_stations
         
+        self._rng = np.random.default_rng(seed)  # Arrivals and all stations draw from this
+        self.station_arrays = StationArrays(num_stations)
         self.stations = [
             Station(
                 station_id=i,
                 name=f"Station {i+1}",
                 mean_processing_time=mean_processing_times[i],
-                cv_processing=cv_processing[i]
+                cv_processing=cv_processing[i],
+                arrays=self.station_arrays,
+                rng=self._rng
             )
             for i in range(num_stations)
         ]
@@ -132,14 +488,17 @@ class ProductionLine:
         self.simulator = DiscreteEventSimulator()
         self.entity_counter = 0
         self.system_wip = 0  # Current WIP in system
-        self.completed_jobs = []
-        self.job_arrival_times = {}
-        self.job_completion_times = {}
-        self.arrival_queue = []  # Queue for arrivals that can't enter due to CONWIP limit
+        self._allocate_jobs(_INITIAL_JOB_CAPACITY)
+        self.arrival_queue = deque()  # Queue for arrivals that can't enter due to CONWIP limit
         self.rejected_arrivals = 0  # Count of arrivals that were queued
         self.queued_arrival_times = []  # Track when arrivals were queued
         self.max_queue_length = 0  
         
+        # Station routing: index of the next station, -1 after the last one
+        self._next_station = np.full(num_stations, -1, dtype=np.int32)
+        self._next_station[:-1] = np.arange(1, num_stations)
+        self._handle_processing_end = self._make_processing_end_handler()
+        
         # Register event handlers
         self.simulator.register_handler(EventType.ARRIVAL, self._handle_arrival)
         self.simulator.register_handler(EventType.PROCESSING_END, self._handle_processing_end)
@@ -147,14 +506,56 @@ class ProductionLine:
         # Statistics
         self.stats_history = []
     
+    def _allocate_jobs(self, capacity: int):
+        """Start empty per-job records with room for job ids below `capacity`."""
+        self._job_arrival = np.empty(capacity, dtype=np.float64)
+        self._job_completion = np.full(capacity, np.nan)
+        self._completed = np.empty(capacity, dtype=np.int64)
+        self._job_capacity = capacity
+        self.num_completed = 0
+    
+    def _grow_jobs(self, min_capacity: int):
+        """Reallocate the per-job records with at least `min_capacity` slots (doubling)."""
+        for name, fill in (('_job_arrival', None), ('_job_completion', np.nan), ('_completed', None)):
+            old = getattr(self, name)
+            capacity = max(min_capacity, 2 * len(old))
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            if fill is not None:
+                new[len(old):] = fill
+            setattr(self, name, new)
+        self._job_capacity = min(len(self._job_arrival), len(self._job_completion), len(self._completed))
+    
+    def _admit_job(self, entry_time: float) -> int:
+        """Create a job entering the line at entry_time and return its id."""
+        self.entity_counter += 1
+        job_id = self.entity_counter
+        self.system_wip += 1
+        if job_id >= self._job_capacity:
+            self._grow_jobs(job_id + 1)
+        self._job_arrival[job_id] = entry_time
+        return job_id
+    
+    @property
+    def completed_jobs(self) -> np.ndarray:
+        """Ids of completed jobs in completion order."""
+        return self._completed[:self.num_completed]
+    
+    @property
+    def job_arrival_times(self) -> np.ndarray:
+        """Line entry time of every admitted job, indexed by job id (entry 0 unused)."""
+        return self._job_arrival[:self.entity_counter + 1]
+    
+    @property
+    def job_completion_times(self) -> np.ndarray:
+        """Completion time by job id (NaN while the job is still in the line)."""
+        return self._job_completion[:self.entity_counter + 1]
+    
     def _handle_arrival(self, event: Event):
         """Handle job arrival event."""
         if self.system_wip < self.conwip_level:
             # Can accept new job
-            self.entity_counter += 1
-            job_id = self.entity_counter
-            self.system_wip += 1
-            self.job_arrival_times[job_id] = self.simulator.clock
+            job_id = self._admit_job(self.simulator.clock)
             
             # Try to start processing at first station
             self._try_start_processing(0, job_id)
@@ -169,106 +570,338 @@ class ProductionLine:
     def _try_start_processing(self, station_id: int, job_id: int):
         """Try to start processing a job at a station."""
         station = self.stations[station_id]
+        arrays = self.station_arrays
         
-        if station.state == StationState.IDLE:
+        if arrays.state[station_id] == _IDLE:
             # Station is idle, start processing immediately
-            station.state = StationState.PROCESSING
-            station.current_job = job_id
-            station.update_statistics(self.simulator.clock)
+            arrays.update_statistics(station_id, self.simulator.clock)
+            arrays.state[station_id] = _PROCESSING
+            arrays.current_job[station_id] = job_id
             
             # Schedule processing end
             processing_time = station.get_processing_time()
             # Ensure processing time is positive
             processing_time = max(0.001, processing_time)
             end_event = Event(
-                time=self.simulator.clock + processing_time,
-                event_type=EventType.PROCESSING_END,
-                station_id=station_id,
-                entity_id=job_id
+                self.simulator.clock + processing_time,
+                _PROCESSING_END,
+                station_id,
+                job_id
             )
             self.simulator.schedule_event(end_event)
         else:
             # Station is busy, add to queue 
-            if job_id not in station.queue:
+            if job_id not in station.queue_set:
                 station.queue.append(job_id)
+                station.queue_set.add(job_id)
     
-    def _handle_processing_end(self, event: Event):
-        """Handle processing completion event."""
-        station_id = event.station_id
-        job_id = event.entity_id
-        station = self.stations[station_id]
+    def _make_processing_end_handler(self) -> Callable[[Event], None]:
+        """
+        Build the PROCESSING_END handler specialized to this line.
         
-        # Update station statistics
-        station.total_processed += 1
-        station.current_job = None
-        station.state = StationState.IDLE
-        station.update_statistics(self.simulator.clock)
+        num_stations never changes after construction, so the "is there a
+        next station" branch becomes a lookup in _next_station (-1 = leaves
+        the line), and the per-line invariants are bound in the closure
+        instead of being loaded from self on every event.
+        """
+        stations = self.stations
+        simulator = self.simulator
+        update_statistics = self.station_arrays.update_statistics
+        total_processed = self.station_arrays.total_processed
+        current_job = self.station_arrays.current_job
+        state = self.station_arrays.state
+        try_start_processing = self._try_start_processing
+        next_station = self._next_station.tolist()  # List indexing beats NumPy scalar access
         
-        # Move job to next station or complete
-        if station_id < self.num_stations - 1:
-            # Move to next station
-            self._try_start_processing(station_id + 1, job_id)
-        else:
-            # Job completed
-            self.job_completion_times[job_id] = self.simulator.clock
-            self.completed_jobs.append(job_id)
-            self.system_wip -= 1
+        def handle_processing_end(event: Event):
+            """Handle processing completion event."""
+            _, _, station_id, job_id = event
+            clock = simulator.clock
+            
+            # Update station statistics
+            update_statistics(station_id, clock)
+            total_processed[station_id] += 1
+            current_job[station_id] = -1
+            state[station_id] = _IDLE
             
-            # Check if we can accept a queued arrival (CONWIP allows it)
-            if self.arrival_queue and self.system_wip < self.conwip_level:
-                # Accept the next queued arrival
-                queued_time = self.arrival_queue.pop(0)
-                self.entity_counter += 1
-                job_id = self.entity_counter
-                self.system_wip += 1
-                # Record actual entry time (may be later than arrival time due to queuing)
-                self.job_arrival_times[job_id] = queued_time
+            # Move job to next station or complete
+            next_id = next_station[station_id]
+            if next_id >= 0:
+                try_start_processing(next_id, job_id)
+            else:
+                # Job completed
+                self._job_completion[job_id] = clock
+                self._completed[self.num_completed] = job_id
+                self.num_completed += 1
+                self.system_wip -= 1
                 
-                # Try to start processing at first station
-                self._try_start_processing(0, job_id)
+                # Check if we can accept a queued arrival (CONWIP allows it)
+                if self.arrival_queue and self.system_wip < self.conwip_level:
+                    # Accept the next queued arrival
+                    queued_time = self.arrival_queue.popleft()
+                    # Record actual entry time (may be later than arrival time due to queuing)
+                    new_job_id = self._admit_job(queued_time)
+                    
+                    # Try to start processing at first station
+                    try_start_processing(0, new_job_id)
+            
+            # Process next job in queue if any
+            station = stations[station_id]
+            if station.queue:
+                next_job = station.queue.popleft()
+                station.queue_set.discard(next_job)
+                try_start_processing(station_id, next_job)
+        
+        return handle_processing_end
+    
+    def _mean_inter_arrival(self) -> float:
+        """Mean of the exponential inter-arrival distribution."""
+        if self.cv_arrival == 1.0:
+            # Exponential (Poisson process)
+            return 1.0 / self.arrival_rate
+        # Use appropriate distribution based on CV
+        return 1.0 / (self.arrival_rate * self.cv_arrival)
+    
+    def _sample_arrival_times(self, duration: float) -> np.ndarray:
+        """Sample ascending arrival times in [0, duration)."""
+        mean_inter_arrival = self._mean_inter_arrival()
+        
+        # Draw inter-arrival times in batches (~20% headroom) instead of one by one
+        batch_size = int(duration / mean_inter_arrival * 1.2) + 32
+        arrival_times = np.cumsum(self._rng.exponential(mean_inter_arrival, batch_size))
+        while arrival_times[-1] < duration:
+            more = np.cumsum(self._rng.exponential(mean_inter_arrival, batch_size))
+            arrival_times = np.concatenate([arrival_times, arrival_times[-1] + more])
         
-        # Process next job in queue if any
-        if station.queue:
-            next_job = station.queue.pop(0)
-            self._try_start_processing(station_id, next_job)
+        return arrival_times[arrival_times < duration]
     
     def generate_arrivals(self, duration: float):
         """Generate arrival events for the simulation duration."""
-        current_time = 0.0
-        while current_time < duration:
-            # Generate inter-arrival time
-            if self.cv_arrival == 1.0:
-                # Exponential (Poisson process)
-                inter_arrival = np.random.exponential(1.0 / self.arrival_rate)
-            else:
-                # Use appropriate distribution based on CV
-                inter_arrival = np.random.exponential(1.0 / (self.arrival_rate * self.cv_arrival))
-            
-            current_time += inter_arrival
-            if current_time < duration:
-                arrival_event = Event(
-                    time=current_time,
-                    event_type=EventType.ARRIVAL
-                )
-                self.simulator.schedule_event(arrival_event)
-    
-    def run(self, duration: float, warmup_period: float = 0.0):
+        arrival_times = self._sample_arrival_times(duration)
+        # At most one job per arrival, so the job records never need to grow mid-run
+        needed = self.entity_counter + len(arrival_times) + 1
+        if needed > self._job_capacity:
+            self._grow_jobs(needed)
+        # Cumulative sums are ascending, so an empty queue can take them as-is
+        self.simulator.bulk_schedule_arrivals(arrival_times, presorted=True)
+    
+    def run(
+        self,
+        duration: float,
+        warmup_period: float = 0.0,
+        engine: str = 'jit',
+        dt: Optional[float] = None
+    ):
         """
         Run the simulation.
         
         Args:
             duration: Total simulation duration
             warmup_period: Period to exclude from statistics (for steady state)
+            engine: 'jit' runs the compiled event loop from a freshly reset
+                line; 'des' runs the handler-based event loop on self.simulator;
+                'euler' runs a time-stepped Markovian approximation (exact in
+                distribution only as dt -> 0 with all CVs = 1) and leaves the
+                line's event state untouched; 'bsp' runs the windowed parallel
+                engine from a freshly reset line (see bsp_engine.run_bsp)
+            dt: Time step for engine='euler' (default: a tenth of the shortest
+                mean processing or inter-arrival time), or window length for
+                engine='bsp' (default: the longest mean processing time)
         """
-        # Generate arrivals
-        self.generate_arrivals(duration)
+        # A non-positive window never advances the bsp loop (and divides by zero in euler)
+        if dt is not None and not dt > 0:
+            raise ValueError(f"dt must be > 0, got {dt!r}")
         
-        # Run simulation
-        self.simulator.run(max_time=duration)
+        if engine == 'euler':
+            return self._run_euler(duration, warmup_period, dt)
+        
+        if engine == 'jit':
+            self._run_jit(duration)
+        elif engine == 'bsp':
+            self._run_bsp(duration, dt)
+        elif engine == 'des':
+            # Generate arrivals
+            self.generate_arrivals(duration)
+            
+            # Run simulation
+            self.simulator.run(max_time=duration)
+        else:
+            raise ValueError(f"Unknown engine: {engine!r}")
         
         # Calculate statistics
         return self.get_statistics(warmup_period)
     
+    def _run_jit(self, duration: float):
+        """Run the compiled event loop and load its results into the line's state."""
+        self.reset()
+        arrays = self.station_arrays
+        
+        (clock, events_processed, entity_counter, system_wip,
+         job_arrival, job_completion, completed,
+         queued_arrivals, backlog_head, max_queue_length,
+         queue, queue_head, queue_len) = _run_sim(
+            duration,
+            self.conwip_level,
+            np.array([s.mean_processing_time for s in self.stations], dtype=np.float64),
+            np.array([s._shape for s in self.stations], dtype=np.float64),
+            np.array([s._scale for s in self.stations], dtype=np.float64),
+            self._sample_arrival_times(duration),
+            self._rng,
+            arrays.state,
+            arrays.current_job,
+            arrays.total_processed,
+            arrays.state_time,
+            arrays.last_state_change_time
+        )
+        
+        self._load_results(
+            clock, events_processed, entity_counter, system_wip, job_arrival, job_completion,
+            completed, queued_arrivals, backlog_head, max_queue_length, queue, queue_head, queue_len
+        )
+    
+    def _run_bsp(self, duration: float, dt: Optional[float]):
+        """Run the bulk-synchronous engine and load its results into the line's state."""
+        self.reset()
+        arrays = self.station_arrays
+        if dt is None:
+            dt = max([s.mean_processing_time for s in self.stations] + [1e-3])
+        arrival_times = self._sample_arrival_times(duration)
+        
+        # One row of processing times per station, enough for every possible job
+        samples = np.empty((self.num_stations, len(arrival_times) + 1))
+        for i, station in enumerate(self.stations):
+            if station._shape > 0:
+                samples[i] = self._rng.gamma(station._shape, station._scale, samples.shape[1])
+            else:
+                samples[i] = station.mean_processing_time
+        np.maximum(samples, 0.001, out=samples)
+        
+        (events_processed, entity_counter, system_wip, job_arrival, job_completion,
+         completed, queued_arrivals, backlog_head, max_queue_length,
+         queue, queue_head, queue_len) = run_bsp(
+            duration,
+            dt,
+            self.conwip_level,
+            arrival_times,
+            samples,
+            arrays.state,
+            arrays.current_job,
+            arrays.total_processed,
+            arrays.state_time,
+            arrays.last_state_change_time
+        )
+        self._load_results(
+            duration, events_processed, entity_counter, system_wip, job_arrival, job_completion,
+            completed, queued_arrivals, backlog_head, max_queue_length, queue, queue_head, queue_len
+        )
+    
+    def _load_results(self, clock, events_processed, entity_counter, system_wip, job_arrival,
+                      job_completion, completed, queued_arrivals, backlog_head, max_queue_length,
+                      queue, queue_head, queue_len):
+        """Copy a compiled engine's job-level results into the line's attributes."""
+        self.simulator.clock = clock
+        self.simulator.stats_arr[SimStat.EVENTS_PROCESSED] = events_processed
+        self.entity_counter = entity_counter
+        self.system_wip = system_wip
+        self._job_arrival = job_arrival
+        self._job_completion = job_completion
+        self._completed = completed
+        self._job_capacity = min(len(job_arrival), len(job_completion), len(completed))
+        self.num_completed = len(completed)
+        self.arrival_queue = deque(queued_arrivals[backlog_head:].tolist())
+        self.rejected_arrivals = len(queued_arrivals)
+        self.queued_arrival_times = queued_arrivals.tolist()
+        self.max_queue_length = max_queue_length
+        
+        capacity = queue.shape[1]
+        for i, station in enumerate(self.stations):
+            waiting = [int(queue[i, (queue_head[i] + k) % capacity]) for k in range(queue_len[i])]
+            station.queue = deque(waiting)
+            station.queue_set = set(waiting)
+    
+    def _run_euler(self, duration: float, warmup_period: float, dt: Optional[float]) -> Dict:
+        """Run _euler_run and shape its output like get_statistics()."""
+        if any(s.cv_processing != 1.0 for s in self.stations):
+            warnings.warn(
+                "engine='euler' models exponential processing times (CV = 1); "
+                "the stations' processing CVs are ignored",
+                stacklevel=3
+            )
+        mean_pts = np.array([s.mean_processing_time for s in self.stations], dtype=np.float64)
+        if dt is None:
+            dt = 0.1 * min(float(mean_pts.min()), self._mean_inter_arrival())
+        n_steps = int(np.ceil(duration / dt))
+        
+        processed, busy_steps, completed, cycle_time_sum, rejected, backlog, max_backlog = _euler_run(
+            n_steps,
+            int(np.ceil(warmup_period / dt)),  # First step whose arrivals are counted
+            dt,
+            1.0 / self._mean_inter_arrival(),
+            1.0 / mean_pts,
+            self.conwip_level,
+            self._rng
+        )
+        
+        # Same definitions as get_statistics
+        simulation_time = n_steps * dt
+        total_time = simulation_time - warmup_period
+        throughput = int(completed) / total_time if total_time > 0 else 0.0
+        avg_cycle_time = cycle_time_sum / completed if completed > 0 else 0.0
+        avg_wip = throughput * avg_cycle_time  # Little's Law
+        
+        busy_time = busy_steps * dt
+        station_table, station_stats = self._station_results(
+            busy_time / simulation_time, processed, busy_time
+        )
+        
+        return {
+            'throughput': throughput,
+            'avg_cycle_time': avg_cycle_time,
+            'avg_wip': avg_wip,
+            'total_completed': int(completed),
+            'station_stats': station_stats,
+            'station_table': station_table,
+            'simulation_time': simulation_time,
+            'rejected_arrivals': int(rejected),
+            'current_queue_length': int(backlog),
+            'max_queue_length': int(max_backlog)
+        }
+    
+    def _station_results(
+        self,
+        utilization: np.ndarray,
+        total_processed: np.ndarray,
+        busy_time: np.ndarray
+    ):
+        """
+        Build the station-level statistics in both layouts.
+        
+        Args:
+            utilization: Utilization per station
+            total_processed: Jobs processed per station
+            busy_time: Time spent processing per station
+        
+        Returns:
+            Tuple (station_table, station_stats): a dict of per-station column
+            arrays (copies) and the same data as a list of per-station dicts
+        """
+        total_processed = np.array(total_processed, dtype=np.int64)
+        avg_processing_time = np.divide(
+            busy_time, total_processed,
+            out=np.zeros(self.num_stations), where=total_processed > 0
+        )
+        station_table = {
+            'station_id': np.arange(self.num_stations),
+            'name': np.array([station.name for station in self.stations]),
+            'utilization': np.array(utilization, dtype=np.float64),
+            'total_processed': total_processed,
+            'avg_processing_time': avg_processing_time
+        }
+        
+        columns = [column.tolist() for column in station_table.values()]
+        station_stats = [dict(zip(station_table, row)) for row in zip(*columns)]
+        return station_table, station_stats
+    
     def get_statistics(self, warmup_period: float = 0.0) -> Dict:
         """
         Calculate and return simulation statistics.
@@ -277,42 +910,34 @@ class ProductionLine:
             warmup_period: Period to exclude from statistics
         
         Returns:
-            Dictionary of statistics
+            Dictionary of statistics (per-station results both as
+            `station_stats` dicts and as `station_table` column arrays)
         """
         # Update all station statistics to current time
-        for station in self.stations:
-            station.update_statistics(self.simulator.clock)
+        arrays = self.station_arrays
+        arrays.update_all_statistics(self.simulator.clock)
+        utilization = arrays.get_utilization(self.simulator.clock)
         
         # Calculate cycle times
-        cycle_times = []
-        for job_id in self.completed_jobs:
-            if job_id in self.job_arrival_times and job_id in self.job_completion_times:
-                arrival_time = self.job_arrival_times[job_id]
-                completion_time = self.job_completion_times[job_id]
-                if arrival_time >= warmup_period:
-                    cycle_times.append(completion_time - arrival_time)
+        completed = self.completed_jobs
+        arrival_times = self._job_arrival[completed]
+        keep = arrival_times >= warmup_period
+        cycle_times = self._job_completion[completed][keep] - arrival_times[keep]
         
         # Calculate throughput
         total_time = self.simulator.clock - warmup_period
         throughput = len(cycle_times) / total_time if total_time > 0 else 0.0
         
         # Calculate average cycle time
-        avg_cycle_time = np.mean(cycle_times) if cycle_times else 0.0
+        avg_cycle_time = float(cycle_times.mean()) if cycle_times.size else 0.0
         
         # Calculate average WIP (using Little's Law)
         avg_wip = throughput * avg_cycle_time if avg_cycle_time > 0 else 0.0
         
         # Station-level statistics
-        station_stats = []
-        for station in self.stations:
-            util = station.get_utilization(self.simulator.clock)
-            station_stats.append({
-                'station_id': station.station_id,
-                'name': station.name,
-                'utilization': util,
-                'total_processed': station.total_processed,
-                'avg_processing_time': station.total_processing_time / station.total_processed if station.total_processed > 0 else 0.0
-            })
+        station_table, station_stats = self._station_results(
+            utilization, arrays.total_processed, arrays.total_processing_time
+        )
         
         return {
             'throughput': throughput,
@@ -320,6 +945,7 @@ class ProductionLine:
             'avg_wip': avg_wip,
             'total_completed': len(cycle_times),
             'station_stats': station_stats,
+            'station_table': station_table,
             'simulation_time': self.simulator.clock,
             'rejected_arrivals': self.rejected_arrivals,
             'current_queue_length': len(self.arrival_queue),
@@ -332,35 +958,69 @@ class ProductionLine:
         mean_processing_time: Optional[float] = None,
         cv_processing: Optional[float] = None
     ):
-        """Update parameters for a specific station."""
+        """Update parameters for a specific station (left unchanged if they are invalid)."""
         station = self.stations[station_id]
-        if mean_processing_time is not None:
-            station.mean_processing_time = mean_processing_time
-        if cv_processing is not None:
-            station.cv_processing = cv_processing
+        if mean_processing_time is None:
+            mean_processing_time = station.mean_processing_time
+        if cv_processing is None:
+            cv_processing = station.cv_processing
+        _check_station_params(station.name, mean_processing_time, cv_processing)
+        
+        station.mean_processing_time = mean_processing_time
+        station.cv_processing = cv_processing
+        station._refresh_sampling()
+    
+    def reconfigure(
+        self,
+        mean_processing_times: List[float],
+        cv_processing: List[float],
+        arrival_rate: float,
+        cv_arrival: float
+    ):
+        """
+        Set new station and arrival parameters and reset the line.
+        
+        The topology (number of stations, CONWIP level) is kept, so a line
+        can be reused across runs instead of being rebuilt. Every parameter
+        is checked first; if any is invalid the line is left unchanged.
+        
+        Args:
+            mean_processing_times: Mean processing time for each station
+            cv_processing: Coefficient of variation for each station
+            arrival_rate: Arrival rate (jobs per time unit)
+            cv_arrival: Coefficient of variation of arrivals
+        """
+        if len(mean_processing_times) != self.num_stations or len(cv_processing) != self.num_stations:
+            raise ValueError(f"Expected parameters for {self.num_stations} stations")
+        for station, mean_pt, cv in zip(self.stations, mean_processing_times, cv_processing):
+            _check_station_params(station.name, mean_pt, cv)
+        if not (np.isfinite(arrival_rate) and arrival_rate > 0):
+            raise ValueError(f"Arrival rate must be finite and > 0, got {arrival_rate!r}")
+        if not (np.isfinite(cv_arrival) and cv_arrival >= 0):
+            raise ValueError(f"Arrival CV must be finite and >= 0, got {cv_arrival!r}")
+        
+        self.arrival_rate = arrival_rate
+        self.cv_arrival = cv_arrival
+        for station, mean_pt, cv in zip(self.stations, mean_processing_times, cv_processing):
+            station.mean_processing_time = mean_pt
+            station.cv_processing = cv
+            station._refresh_sampling()
+        self.reset()
     
     def reset(self):
         """Reset the production line to initial state."""
         self.simulator.reset()
         self.entity_counter = 0
         self.system_wip = 0
-        self.completed_jobs = []
-        self.job_arrival_times = {}
-        self.job_completion_times = {}
-        self.arrival_queue = []
+        self._allocate_jobs(_INITIAL_JOB_CAPACITY)
+        self.arrival_queue = deque()
         self.rejected_arrivals = 0
         self.queued_arrival_times = []
         self.max_queue_length = 0
         self.stats_history = []
         
+        self.station_arrays.reset()
         for station in self.stations:
-            station.state = StationState.IDLE
-            station.current_job = None
-            station.queue = []
+            station.queue = deque()
+            station.queue_set = set()
             station.buffer = []
-            station.total_processed = 0
-            station.total_processing_time = 0.0
-            station.total_idle_time = 0.0
-            station.total_blocked_time = 0.0
-            station.total_starved_time = 0.0
-            station.last_state_change_time = 0.0
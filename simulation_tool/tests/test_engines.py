@@ -0,0 +1,113 @@
+"""
+Cross-checks of the compiled engines and the event heap against reference implementations.
+"""
+
+import heapq
+
+import numpy as np
+import pytest
+
+from simulation_engine import ProductionLine
+from simulation_engine.discrete_event_sim import HeapQueue
+
+_SCALAR_KEYS = (
+    'throughput', 'avg_cycle_time', 'avg_wip', 'total_completed',
+    'rejected_arrivals', 'current_queue_length', 'max_queue_length'
+)
+
+
+def _make_line(seed: int, **overrides) -> ProductionLine:
+    params = dict(
+        num_stations=4,
+        conwip_level=10,
+        mean_processing_times=[1.0, 0.9, 1.0, 0.8],
+        cv_processing=[1.0, 0.5, 0.0, 2.0],
+        arrival_rate=0.95,
+        seed=seed
+    )
+    params.update(overrides)
+    return ProductionLine(**params)
+
+
+def _assert_same_statistics(expected, actual):
+    for key in _SCALAR_KEYS:
+        assert actual[key] == pytest.approx(expected[key], rel=1e-12, abs=1e-12), key
+    for column, values in expected['station_table'].items():
+        if values.dtype.kind == 'f':
+            np.testing.assert_allclose(actual['station_table'][column], values, rtol=1e-12, atol=1e-12)
+        else:
+            np.testing.assert_array_equal(actual['station_table'][column], values)
+
+
+@pytest.mark.parametrize('seed', [0, 1])
+@pytest.mark.parametrize('arrival_rate, conwip_level', [(0.5, 10), (0.95, 3), (2.0, 5)])
+def test_jit_matches_des(seed, arrival_rate, conwip_level):
+    # Both engines draw the same random streams in the same order
+    des = _make_line(seed, arrival_rate=arrival_rate, conwip_level=conwip_level)
+    jit = _make_line(seed, arrival_rate=arrival_rate, conwip_level=conwip_level)
+    
+    _assert_same_statistics(
+        des.run(2000.0, 100.0, engine='des'),
+        jit.run(2000.0, 100.0, engine='jit')
+    )
+
+
+@pytest.mark.parametrize('dt', [None, 0.25, 5.0])
+def test_bsp_matches_jit_when_deterministic_and_conwip_slack(dt):
+    # With CV = 0 and a CONWIP level that never binds, the only bsp
+    # approximation (late CONWIP releases) has nothing to delay, so every
+    # job follows the same trajectory. The event loops also handle the
+    # first event past the horizon, which bsp does not, so compare the
+    # job records up to the horizon.
+    duration = 2000.0
+    overrides = dict(cv_processing=[0.0] * 4, conwip_level=100_000, arrival_rate=0.8)
+    jit = _make_line(7, **overrides)
+    bsp = _make_line(7, **overrides)
+    jit.run(duration, engine='jit')
+    bsp.run(duration, engine='bsp', dt=dt)
+    
+    # Entry 0 of the job records is unused
+    np.testing.assert_allclose(bsp.job_arrival_times[1:], jit.job_arrival_times[1:], rtol=1e-12)
+    
+    jit_done = jit.completed_jobs[jit.job_completion_times[jit.completed_jobs] <= duration]
+    np.testing.assert_array_equal(bsp.completed_jobs, jit_done)
+    np.testing.assert_allclose(
+        bsp.job_completion_times[bsp.completed_jobs],
+        jit.job_completion_times[jit_done],
+        rtol=1e-12
+    )
+    assert bsp.completed_jobs.size > 1000
+
+
+def test_heap_queue_pops_in_heapq_order():
+    rng = np.random.default_rng(3)
+    queue = HeapQueue(capacity=4)  # Small, so pushes exercise _grow
+    reference = []
+    
+    batch = np.sort(rng.random(50))
+    queue.push_many(batch, 0, presorted=True)
+    for time in batch.tolist():
+        heapq.heappush(reference, (time, 0, -1, -1))
+    
+    popped, expected = [], []
+    for step in range(500):
+        if step % 3 == 2 and reference:
+            popped.append(queue.pop())
+            expected.append(heapq.heappop(reference))
+        else:
+            event = (float(rng.random()), step % 4, step % 7, step)
+            queue.push(*event)
+            heapq.heappush(reference, event)
+    
+    more = rng.random(40)
+    queue.push_many(more, 3)
+    for time in more.tolist():
+        heapq.heappush(reference, (time, 3, -1, -1))
+    
+    while reference:
+        assert queue.peek_time() == reference[0][0]
+        popped.append(queue.pop())
+        expected.append(heapq.heappop(reference))
+    
+    assert len(queue) == 0
+    assert [tuple(map(float, event)) for event in popped] == [tuple(map(float, event)) for event in expected]
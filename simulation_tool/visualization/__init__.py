@@ -2,12 +2,22 @@
 Visualization components for the simulation tool
 """
 
-from .charts import plot_wip_over_time, plot_cycle_time_over_time, plot_utilization
-from .widgets import create_station_controls
+from .widgets import create_station_arrays, create_station_controls
 
 __all__ = [
     'plot_wip_over_time',
     'plot_cycle_time_over_time',
     'plot_utilization',
+    'create_station_arrays',
     'create_station_controls'
 ]
+
+# Chart helpers pull in Plotly, so they are imported on first access
+_CHARTS = ('plot_wip_over_time', 'plot_cycle_time_over_time', 'plot_utilization')
+
+
+def __getattr__(name):
+    if name in _CHARTS:
+        from . import charts
+        return getattr(charts, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -102,14 +102,15 @@ def plot_utilization(
     """
     fig = go.Figure()
     
-    colors = ['#2ca02c' if u < 0.8 else '#d62728' if u > 0.95 else '#ff7f0e' 
-              for u in utilizations]
+    u = np.asarray(utilizations, dtype=float)
+    colors = np.where(u < 0.8, '#2ca02c', np.where(u > 0.95, '#d62728', '#ff7f0e'))
+    text = np.char.mod('%.1f%%', u * 100.0)
     
     fig.add_trace(go.Bar(
         x=station_names,
-        y=utilizations,
-        marker_color=colors,
-        text=[f'{u:.1%}' for u in utilizations],
+        y=u,
+        marker_color=colors.tolist(),
+        text=text.tolist(),
         textposition='outside'
     ))
     
@@ -118,7 +119,8 @@ def plot_utilization(
         xaxis_title='Station',
         yaxis_title='Utilization',
         yaxis=dict(range=[0, 1.1]),
-        template='plotly_white'
+        template='plotly_white',
+        uirevision='utilization'  # Keep zoom/legend state when only the data changes
     )
     
     # Add utilization threshold lines
@@ -178,7 +180,8 @@ def plot_metrics_comparison(
         xaxis=dict(tickmode='array', tickvals=x_pos, ticktext=metric_labels),
         yaxis_title='Value',
         barmode='group',
-        template='plotly_white'
+        template='plotly_white',
+        uirevision='metrics-comparison'  # Keep zoom/legend state when only the data changes
     )
     
     return fig
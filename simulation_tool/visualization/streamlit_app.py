@@ -1,32 +1,296 @@
 """
 Main Streamlit application for Factory Physics Simulation Tool
+
+Launched through the entry script: streamlit run simulation_tool/app.py
 """
 
+import threading
+import time
 import streamlit as st
 import numpy as np
 import pandas as pd
-from typing import Dict, List
-import sys
-import os
-
-# Add parent directory to path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pyarrow as pa
+from typing import Dict, List, Tuple
 
 from simulation_engine import ProductionLine, calculate_cycle_time, calculate_utilization
-from visualization.charts import (
-    plot_wip_over_time,
-    plot_cycle_time_over_time,
-    plot_utilization,
-    plot_metrics_comparison,
-    plot_factory_physics_equation
-)
-from visualization.widgets import (
-    create_station_controls,
+from .widgets import (
+    create_station_arrays,
     create_variability_controls,
     create_system_controls
 )
 
 
+# Interactive runs are short: the handler-based loop finishes them in milliseconds,
+# while the compiled default costs seconds of Numba compilation on a cold cache
+_ENGINE = 'des'
+
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _get_engine(num_stations: int, conwip_level: int) -> Tuple[ProductionLine, threading.Lock]:
+    """
+    Shared ProductionLine for one line topology (reconfigured for each run).
+    
+    Cached resources are shared by every session, so the line comes with a
+    lock that must be held while it is reconfigured and run.
+    
+    Returns:
+        Tuple (production line, its lock)
+    """
+    production_line = ProductionLine(
+        num_stations=num_stations,
+        conwip_level=conwip_level
+    )
+    return production_line, threading.Lock()
+
+
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+def _run_simulation(
+    num_stations: int,
+    conwip_level: int,
+    mean_processing_times: Tuple[float, ...],
+    cv_processing: Tuple[float, ...],
+    arrival_rate: float,
+    demand_cv: float,
+    duration: float,
+    warmup_period: float
+) -> Dict:
+    """
+    Run the production line simulation (cached on its parameters).
+    
+    Streamlit reruns the whole script on every interaction, so repeating a
+    parameter set returns the stored statistics instead of simulating again.
+    Only the plain stats dict is returned (and pickled into the cache),
+    with the station table added as a ready-to-display Arrow table. The
+    line itself comes from _get_engine and is reused across runs.
+    
+    Returns:
+        Statistics dictionary from ProductionLine.run, plus 'station_arrow'
+    """
+    production_line, lock = _get_engine(num_stations, conwip_level)
+    with lock:
+        production_line.reconfigure(mean_processing_times, cv_processing, arrival_rate, demand_cv)
+        stats = production_line.run(duration=duration, warmup_period=warmup_period, engine=_ENGINE)
+    stats['station_arrow'] = pa.Table.from_pydict(stats['station_table'])
+    return stats
+
+
+# With auto-run on, changes closer together than this (seconds) are coalesced
+_AUTO_RUN_DEBOUNCE_S = 0.15
+
+# Decimal places kept in the equation-HTML cache key
+_EQUATION_DECIMALS = 4
+
+# Metrics shown in the baseline comparison chart
+_COMPARISON_METRICS = ('throughput', 'avg_cycle_time', 'avg_wip')
+
+# Static page text (rendered unchanged on every rerun)
+_INTRO_MD = """
+Interactive simulation tool demonstrating Factory Physics principles.
+Adjust parameters below to see how variability affects cycle time and WIP.
+"""
+
+_FOOTER_MD = """
+### About
+This tool demonstrates Factory Physics principles:
+- **Little's Law**: WIP = Throughput × Cycle Time
+- **Kingman's Approximation**: Shows how variability and utilization affect cycle time
+- **CONWIP Control**: Limits total work-in-process in the system
+
+Adjust the variability sliders to see how increased variability increases cycle time and WIP.
+"""
+
+
+@st.cache_data(show_spinner=False)
+def _cached_util_fig(station_names: Tuple[str, ...], utilizations: Tuple[float, ...]):
+    """plot_utilization, cached on its inputs."""
+    from .charts import plot_utilization  # Plotly loads on first use, after the sidebar has rendered
+    
+    return plot_utilization(list(station_names), list(utilizations))
+
+
+@st.cache_data(show_spinner=False)
+def _cached_comparison_fig(baseline_key: Tuple[float, ...], current_key: Tuple[float, ...]):
+    """plot_metrics_comparison, cached on the compared metric values."""
+    from .charts import plot_metrics_comparison
+    
+    return plot_metrics_comparison(
+        dict(zip(_COMPARISON_METRICS, baseline_key)),
+        dict(zip(_COMPARISON_METRICS, current_key))
+    )
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def _cached_equation_html(util: float, cv_arr: float, cv_proc: float, mean_pt: float, ct: float) -> str:
+    """plot_factory_physics_equation, cached on its (rounded) inputs."""
+    from .charts import plot_factory_physics_equation
+    
+    return plot_factory_physics_equation(util, cv_arr, cv_proc, mean_pt, ct)
+
+
+def _equation_html(util: float, cv_arr: float, cv_proc: float, mean_pt: float, ct: float) -> str:
+    """
+    Equation HTML for one station.
+    
+    Inputs are rounded to _EQUATION_DECIMALS (finer than the 2 places
+    displayed) before the cache lookup, so values that differ only in
+    noise while scrubbing a slider share one entry.
+    """
+    return _cached_equation_html(
+        *(round(float(x), _EQUATION_DECIMALS) for x in (util, cv_arr, cv_proc, mean_pt, ct))
+    )
+
+
+def _comparison_key(stats: Dict) -> Tuple[float, ...]:
+    """The values of stats that the comparison chart plots."""
+    return tuple(stats.get(m, 0) for m in _COMPARISON_METRICS)
+
+
+@st.fragment
+def _render_controls():
+    """
+    Sidebar controls and the run button.
+    
+    A fragment, so adjusting a widget reruns only the sidebar and leaves the
+    results panel as it is; a completed run triggers a full rerun to show it.
+    With auto-run on, a parameter change starts a run by itself once the
+    inputs have been quiet for _AUTO_RUN_DEBOUNCE_S, so dragging a slider
+    does not start a simulation on every tick.
+    """
+    st.header("⚙️ Controls")
+    
+    # System parameters
+    system_params = create_system_controls()
+    
+    st.divider()
+    
+    # Variability controls
+    variability_params = create_variability_controls()
+    
+    st.divider()
+    
+    # Station parameters (one array per column, straight from the table)
+    mean_processing_times, cv_processing = create_station_arrays(
+        num_stations=system_params['num_stations'],
+        default_mean_pt=1.0,
+        default_cv=variability_params['processing_cv']
+    )
+    
+    st.divider()
+    
+    auto_run = st.toggle("Auto-run on change", value=False)
+    
+    # Run simulation button
+    run_clicked = st.button("🚀 Run Simulation", type="primary", use_container_width=True)
+    
+    # _run_simulation arguments (tuples, since the cache key must be hashable)
+    sim_args = (
+        system_params['num_stations'],
+        system_params['conwip_level'],
+        tuple(mean_processing_times.tolist()),
+        tuple(cv_processing.tolist()),
+        variability_params['arrival_rate'],
+        variability_params['demand_cv'],
+        system_params['simulation_duration'],
+        system_params['warmup_period']
+    )
+    
+    if not run_clicked:
+        if not auto_run or sim_args == st.session_state.get('run_args'):
+            return
+        
+        # Debounce: a change right after the previous one waits out the quiet
+        # period first; a newer change during the wait supersedes this run
+        now = time.monotonic()
+        quiet = now - st.session_state.get('last_change', 0.0)
+        st.session_state.last_change = now
+        if quiet < _AUTO_RUN_DEBOUNCE_S:
+            time.sleep(_AUTO_RUN_DEBOUNCE_S)
+            st.rerun()
+    
+    with st.spinner("Running simulation..."):
+        stats = _run_simulation(*sim_args)
+    
+    # Store results (and the inputs that produced them) in session state
+    # The comparison key is computed once here, so reruns compare two small tuples
+    current_key = _comparison_key(stats)
+    if 'baseline_key' not in st.session_state:
+        st.session_state.baseline_key = current_key
+    st.session_state.current_stats = stats
+    st.session_state.current_key = current_key
+    st.session_state.run_args = sim_args
+    st.session_state.current_params = {
+        'mean_processing_times': mean_processing_times,
+        'cv_processing': cv_processing,
+        'demand_cv': variability_params['demand_cv']
+    }
+    st.rerun()  # Redraw the results panel with the new run
+
+
+@st.fragment
+def _render_results():
+    """Metrics, charts and tables for the latest run in session state."""
+    if 'current_stats' not in st.session_state:
+        st.info("👈 Adjust parameters in the sidebar and click 'Run Simulation' to start.")
+        return
+    
+    stats = st.session_state.current_stats
+    params = st.session_state.current_params
+    
+    # Key metrics: (label, value, unit)
+    metrics = (
+        ("Throughput", f"{stats['throughput']:.2f}", "jobs/time"),
+        ("Avg Cycle Time", f"{stats['avg_cycle_time']:.2f}", "time units"),
+        ("Avg WIP", f"{stats['avg_wip']:.2f}", "jobs"),
+        ("Completed Jobs", f"{stats['total_completed']}", "")
+    )
+    for col, (label, value, unit) in zip(st.columns(len(metrics)), metrics):
+        col.metric(label, value, unit)
+    
+    st.divider()
+    
+    # Station utilization
+    station_table = stats['station_table']
+    station_names = station_table['name'].tolist()
+    utils = station_table['utilization']
+    
+    fig_util = _cached_util_fig(tuple(station_names), tuple(utils.tolist()))
+    st.plotly_chart(fig_util, use_container_width=True, key='util_chart')
+    
+    # Factory Physics equation display
+    st.subheader("Factory Physics Equation")
+    
+    if len(station_names):
+        # Kingman cycle time for every station in one batch call
+        mean_pts = params['mean_processing_times']
+        cv_procs = params['cv_processing']
+        cv_arr = params['demand_cv']
+        cts = calculate_cycle_time(mean_pts, utils, cv_arr, cv_procs)
+        
+        # Worked example for the first station
+        equation_html = _equation_html(utils[0], cv_arr, cv_procs[0], mean_pts[0], cts[0])
+        st.markdown(equation_html, unsafe_allow_html=True)
+        
+        st.dataframe(
+            pd.DataFrame(
+                {'te': mean_pts, 'ce': cv_procs, 'u': utils, 'CT (Kingman)': cts},
+                index=station_names
+            ),
+            width='stretch'
+        )
+    
+    # Comparison with baseline
+    baseline_key = st.session_state.baseline_key
+    current_key = st.session_state.current_key
+    if baseline_key != current_key:
+        st.subheader("Comparison with Baseline")
+        fig_comp = _cached_comparison_fig(baseline_key, current_key)
+        st.plotly_chart(fig_comp, use_container_width=True, key='comparison_chart')
+    
+    # Detailed station statistics
+    st.subheader("Station Statistics")
+    st.dataframe(stats['station_arrow'], width='stretch', hide_index=True)
+
+
 def main():
     """Main Streamlit application"""
     
@@ -37,147 +301,16 @@ def main():
     )
     
     st.title("🏭 Factory Physics Simulation Tool")
-    st.markdown("""
-    Interactive simulation tool demonstrating Factory Physics principles.
-    Adjust parameters below to see how variability affects cycle time and WIP.
-    """)
+    st.markdown(_INTRO_MD)
     
     # Sidebar for controls
     with st.sidebar:
-        st.header("⚙️ Controls")
-        
-        # System parameters
-        system_params = create_system_controls()
-        
-        st.divider()
-        
-        # Variability controls
-        variability_params = create_variability_controls()
-        
-        st.divider()
-        
-        # Station parameters
-        station_params = create_station_controls(
-            num_stations=system_params['num_stations'],
-            default_mean_pt=1.0,
-            default_cv=variability_params['processing_cv']
-        )
-        
-        st.divider()
-        
-        # Run simulation button
-        run_simulation = st.button("🚀 Run Simulation", type="primary", use_container_width=True)
+        _render_controls()
     
     # Main content area
-    if run_simulation:
-        with st.spinner("Running simulation..."):
-            # Initialize production line
-            mean_processing_times = [
-                station_params[i]['mean_processing_time'] 
-                for i in range(system_params['num_stations'])
-            ]
-            cv_processing = [
-                station_params[i]['cv_processing'] 
-                for i in range(system_params['num_stations'])
-            ]
-            
-            production_line = ProductionLine(
-                num_stations=system_params['num_stations'],
-                conwip_level=system_params['conwip_level'],
-                mean_processing_times=mean_processing_times,
-                cv_processing=cv_processing,
-                arrival_rate=variability_params['arrival_rate'],
-                cv_arrival=variability_params['demand_cv']
-            )
-            
-            # Run simulation
-            stats = production_line.run(
-                duration=system_params['simulation_duration'],
-                warmup_period=system_params['warmup_period']
-            )
-            
-            # Store results in session state
-            if 'baseline_stats' not in st.session_state:
-                st.session_state.baseline_stats = stats
-            st.session_state.current_stats = stats
-    
-    # Display results
-    if 'current_stats' in st.session_state:
-        stats = st.session_state.current_stats
-        
-        # Key metrics
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            st.metric("Throughput", f"{stats['throughput']:.2f}", "jobs/time")
-        with col2:
-            st.metric("Avg Cycle Time", f"{stats['avg_cycle_time']:.2f}", "time units")
-        with col3:
-            st.metric("Avg WIP", f"{stats['avg_wip']:.2f}", "jobs")
-        with col4:
-            st.metric("Completed Jobs", f"{stats['total_completed']}", "")
-        
-        st.divider()
-        
-        # Station utilization
-        station_names = [s['name'] for s in stats['station_stats']]
-        utilizations = [s['utilization'] for s in stats['station_stats']]
-        
-        fig_util = plot_utilization(station_names, utilizations)
-        st.plotly_chart(fig_util, use_container_width=True)
-        
-        # Factory Physics equation display
-        st.subheader("Factory Physics Equation")
-        
-        # Calculate for first station as example
-        if stats['station_stats']:
-            first_station = stats['station_stats'][0]
-            mean_pt = station_params[0]['mean_processing_time']
-            cv_proc = station_params[0]['cv_processing']
-            util = first_station['utilization']
-            cv_arr = variability_params['demand_cv']
-            
-            ct = calculate_cycle_time(
-                mean_pt,
-                util,
-                cv_arr,
-                cv_proc
-            )
-            
-            equation_html = plot_factory_physics_equation(
-                util, cv_arr, cv_proc, mean_pt, ct
-            )
-            st.markdown(equation_html, unsafe_allow_html=True)
-        
-        # Comparison with baseline
-        if 'baseline_stats' in st.session_state and st.session_state.baseline_stats != stats:
-            st.subheader("Comparison with Baseline")
-            fig_comp = plot_metrics_comparison(
-                st.session_state.baseline_stats,
-                stats
-            )
-            st.plotly_chart(fig_comp, use_container_width=True)
-        
-        # Detailed station statistics
-        st.subheader("Station Statistics")
-        station_df = pd.DataFrame(stats['station_stats'])
-        st.dataframe(station_df, use_container_width=True)
-    
-    else:
-        st.info("👈 Adjust parameters in the sidebar and click 'Run Simulation' to start.")
+    _render_results()
     
     # Footer
     st.divider()
-    st.markdown("""
-    ### About
-    This tool demonstrates Factory Physics principles:
-    - **Little's Law**: WIP = Throughput × Cycle Time
-    - **Kingman's Approximation**: Shows how variability and utilization affect cycle time
-    - **CONWIP Control**: Limits total work-in-process in the system
-    
-    Adjust the variability sliders to see how increased variability increases cycle time and WIP.
-    """)
-
+    st.markdown(_FOOTER_MD)
 
-if __name__ == "__main__":
-    main()
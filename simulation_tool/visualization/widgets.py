@@ -3,7 +3,93 @@ Widget components for Streamlit UI
 """
 
 import streamlit as st
-from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+from types import MappingProxyType
+from typing import Dict, List, Optional, Tuple
+
+# Widget configuration, built once at import instead of on every rerun
+# (read-only mappings, splatted into the widget calls)
+
+# Discrete slider positions (select_slider options), rounded so values match exactly
+_CV_GRID = tuple(np.round(np.arange(0.0, 3.01, 0.1), 2).tolist())
+_RATE_GRID = tuple(np.round(np.arange(0.01, 2.001, 0.01), 2).tolist())
+
+_STATION_COLUMN_CONFIG = MappingProxyType({
+    'Mean PT': st.column_config.NumberColumn(min_value=0.1, max_value=10.0, step=0.1, required=True),
+    'CV': st.column_config.NumberColumn(min_value=0.0, max_value=3.0, step=0.1, required=True)
+})
+
+_CV_SLIDER_CFG = MappingProxyType(dict(options=_CV_GRID, value=1.0))
+_RATE_SLIDER_CFG = MappingProxyType(dict(options=_RATE_GRID, value=0.5))
+
+_VAR_HELP = MappingProxyType({
+    'processing_cv': "Coefficient of variation for processing times",
+    'raw_material_cv': "Variability in raw material properties",
+    'demand_cv': "Variability in demand/arrival rate",
+    'arrival_rate': "Jobs per time unit"
+})
+
+_NUM_STATIONS_CFG = MappingProxyType(dict(min_value=2, max_value=10, value=4, step=1))
+_CONWIP_CFG = MappingProxyType(dict(
+    min_value=1, max_value=50, value=10, step=1, help="Maximum WIP allowed in system"
+))
+_DURATION_CFG = MappingProxyType(dict(min_value=100.0, max_value=10000.0, value=1000.0, step=100.0))
+_WARMUP_CFG = MappingProxyType(dict(
+    min_value=0.0, max_value=1000.0, value=100.0, step=50.0, help="Period to exclude from statistics"
+))
+
+
+def create_station_arrays(
+    num_stations: int,
+    default_mean_pt: float = 1.0,
+    default_cv: float = 1.0
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Create Streamlit controls for station parameters, returned as arrays.
+    
+    One editable table (a row per station) instead of two sliders per
+    station, so the whole set is a single widget. Cell edits are kept in
+    st.session_state.station_edits, so they survive a change in the number
+    of stations (which makes Streamlit start a fresh editor); unedited
+    and cleared cells follow the defaults.
+    
+    Args:
+        num_stations: Number of stations
+        default_mean_pt: Default mean processing time
+        default_cv: Default coefficient of variation
+    
+    Returns:
+        Tuple (mean_processing_times, cv_processing) of float arrays, one
+        entry per station
+    """
+    st.subheader("Station Parameters")
+    
+    # Fold the editor's latest edits ({row: {column: value}}) into the persistent ones
+    edits = st.session_state.setdefault('station_edits', {})
+    editor_state = st.session_state.get('station_table')
+    if editor_state:
+        for row, changes in editor_state.get('edited_rows', {}).items():
+            edits.setdefault(int(row), {}).update(changes)
+    
+    table = pd.DataFrame(
+        {
+            'Mean PT': [default_mean_pt] * num_stations,
+            'CV': [default_cv] * num_stations
+        },
+        index=[f"Station {i+1}" for i in range(num_stations)]
+    )
+    for row, changes in edits.items():
+        if row < num_stations:
+            for column, value in changes.items():
+                table.iloc[row, table.columns.get_loc(column)] = value
+    
+    edited = st.data_editor(table, column_config=_STATION_COLUMN_CONFIG, key='station_table')
+    
+    # Cleared cells come back as NaN, which the simulation rejects
+    mean_pts = edited['Mean PT'].to_numpy(dtype=float, na_value=default_mean_pt)
+    cvs = edited['CV'].to_numpy(dtype=float, na_value=default_cv)
+    return mean_pts, cvs
 
 
 def create_station_controls(
@@ -22,40 +108,15 @@ def create_station_controls(
     Returns:
         Dictionary with station parameters
     """
-    params = {}
-    
-    st.subheader("Station Parameters")
+    mean_pts, cvs = create_station_arrays(num_stations, default_mean_pt, default_cv)
     
-    cols = st.columns(num_stations)
-    
-    for i in range(num_stations):
-        with cols[i]:
-            st.write(f"**Station {i+1}**")
-            
-            mean_pt = st.slider(
-                f"Mean PT",
-                min_value=0.1,
-                max_value=10.0,
-                value=default_mean_pt,
-                step=0.1,
-                key=f"mean_pt_{i}"
-            )
-            
-            cv = st.slider(
-                f"CV",
-                min_value=0.0,
-                max_value=3.0,
-                value=default_cv,
-                step=0.1,
-                key=f"cv_{i}"
-            )
-            
-            params[i] = {
-                'mean_processing_time': mean_pt,
-                'cv_processing': cv
-            }
-    
-    return params
+    return {
+        i: {
+            'mean_processing_time': mean_pt,
+            'cv_processing': cv
+        }
+        for i, (mean_pt, cv) in enumerate(zip(mean_pts.tolist(), cvs.tolist()))
+    }
 
 
 def create_variability_controls() -> Dict:
@@ -70,41 +131,21 @@ def create_variability_controls() -> Dict:
     col1, col2 = st.columns(2)
     
     with col1:
-        processing_cv = st.slider(
-            "Processing Variability (CV)",
-            min_value=0.0,
-            max_value=3.0,
-            value=1.0,
-            step=0.1,
-            help="Coefficient of variation for processing times"
+        processing_cv = st.select_slider(
+            "Processing Variability (CV)", **_CV_SLIDER_CFG, help=_VAR_HELP['processing_cv']
         )
         
-        raw_material_cv = st.slider(
-            "Raw Material Variability (CV)",
-            min_value=0.0,
-            max_value=3.0,
-            value=1.0,
-            step=0.1,
-            help="Variability in raw material properties"
+        raw_material_cv = st.select_slider(
+            "Raw Material Variability (CV)", **_CV_SLIDER_CFG, help=_VAR_HELP['raw_material_cv']
         )
     
     with col2:
-        demand_cv = st.slider(
-            "Demand Variability (CV)",
-            min_value=0.0,
-            max_value=3.0,
-            value=1.0,
-            step=0.1,
-            help="Variability in demand/arrival rate"
+        demand_cv = st.select_slider(
+            "Demand Variability (CV)", **_CV_SLIDER_CFG, help=_VAR_HELP['demand_cv']
         )
         
-        arrival_rate = st.slider(
-            "Arrival Rate",
-            min_value=0.01,
-            max_value=2.0,
-            value=0.5,
-            step=0.01,
-            help="Jobs per time unit"
+        arrival_rate = st.select_slider(
+            "Arrival Rate", **_RATE_SLIDER_CFG, help=_VAR_HELP['arrival_rate']
         )
     
     return {
@@ -127,40 +168,12 @@ def create_system_controls() -> Dict:
     col1, col2 = st.columns(2)
     
     with col1:
-        num_stations = st.number_input(
-            "Number of Stations",
-            min_value=2,
-            max_value=10,
-            value=4,
-            step=1
-        )
-        
-        conwip_level = st.number_input(
-            "CONWIP Level",
-            min_value=1,
-            max_value=50,
-            value=10,
-            step=1,
-            help="Maximum WIP allowed in system"
-        )
+        num_stations = st.number_input("Number of Stations", **_NUM_STATIONS_CFG)
+        conwip_level = st.number_input("CONWIP Level", **_CONWIP_CFG)
     
     with col2:
-        simulation_duration = st.number_input(
-            "Simulation Duration",
-            min_value=100.0,
-            max_value=10000.0,
-            value=1000.0,
-            step=100.0
-        )
-        
-        warmup_period = st.number_input(
-            "Warmup Period",
-            min_value=0.0,
-            max_value=1000.0,
-            value=100.0,
-            step=50.0,
-            help="Period to exclude from statistics"
-        )
+        simulation_duration = st.number_input("Simulation Duration", **_DURATION_CFG)
+        warmup_period = st.number_input("Warmup Period", **_WARMUP_CFG)
     
     return {
         'num_stations': int(num_stations),